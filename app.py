@@ -7,55 +7,144 @@ Gebruik:
 from __future__ import annotations
 
 import argparse
+import atexit
+import gzip
+import hashlib
 import json
-from dataclasses import dataclass, field
+import mimetypes
+import os
+import pickle
+import re
+import tarfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from email.utils import formatdate, parsedate_to_datetime
+from functools import lru_cache
 from http import HTTPStatus
 from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from types import MappingProxyType
+from urllib.parse import unquote, urlsplit
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import pricing
+from pricing import Option, PricingEngine, Service, Step
+
+try:  # orjson is optioneel; zonder valt alles terug op de standaardbibliotheek
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:  # markupsafe escapet in C; html.escape levert voor onze data dezelfde uitvoer
+    from markupsafe import escape
+except ImportError:  # pragma: no cover
+    from html import escape
+
+try:  # ijson maakt het inlezen van grote catalogi incrementeel
+    import ijson
+except ImportError:  # pragma: no cover
+    ijson = None
+
+try:  # brotli levert nog kleinere voorgecomprimeerde bestanden dan gzip
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+try:  # zstandard geeft een kleiner deploy-archief; anders schrijven we site.tar.gz
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
 
 ROOT = Path(__file__).parent
 DATA_DIR = ROOT / "data"
 PUBLIC_DIR = ROOT / "public"
 ASSET_DIR = PUBLIC_DIR / "assets"
 IMAGE_DIR = PUBLIC_DIR / "images"
+MANIFEST_PATH = PUBLIC_DIR / ".build-cache.json"
+PARALLEL_MIN_SERVICES = 8
+WRITE_WORKERS = 8
+MAX_BATCH_QUOTES = 100
+MAX_BODY_BYTES = 65536
+# Alleen korte bodies (een gewone configurator-aanvraag) komen in de antwoordcache; zo bepaalt
+# een client niet hoeveel geheugen de cache inneemt
+QUOTE_CACHE_MAX_BODY = 2048
+COMPRESSIBLE_SUFFIXES = frozenset({".html", ".svg", ".css", ".js"})
+ZSTD_ARCHIVE_PATH = PUBLIC_DIR / "site.tar.zst"
+GZIP_ARCHIVE_PATH = PUBLIC_DIR / "site.tar.gz"
+ARCHIVE_PATHS = (ZSTD_ARCHIVE_PATH, GZIP_ARCHIVE_PATH)
+ARCHIVE_EXCLUDE = frozenset({".build-cache.json", ".svgcache.json"})
 
 
-@dataclass
-class Option:
-    label: str
-    value: str
-    price: float = 0.0
+def _stdlib_json_dumps(payload: Any) -> bytes:
+    # Zelfde bytes als orjson, zodat een build zonder orjson de pagina's en manifest niet herschrijft
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
 
 
-@dataclass
-class Step:
-    id: str
-    label: str
-    type: str
-    options: List[Option] = field(default_factory=list)
-    min: Optional[float] = None
-    max: Optional[float] = None
-    price_per_unit: Optional[float] = None
+if orjson is not None:
+    # Direct de C-functies binden: geen extra Python-frame of branch per request
+    json_loads = orjson.loads
+    json_dumps = orjson.dumps
+else:
+    json_loads = json.loads
+    json_dumps = _stdlib_json_dumps
 
 
-@dataclass
-class Service:
-    id: str
-    name: str
-    tagline: str
-    summary: str
-    base_price: float
-    cta: str
-    steps: List[Step]
-    highlights: List[str] = field(default_factory=list)
+def _gzip(data: bytes) -> bytes:
+    # mtime=0 houdt de .gz-bestanden reproduceerbaar tussen builds
+    return gzip.compress(data, compresslevel=9, mtime=0)
 
-    @property
-    def hero_image(self) -> str:
-        return f"images/{self.id}-hero.svg"
 
+def _brotli(data: bytes) -> bytes:
+    return brotli.compress(data, quality=11)
 
-@dataclass
+
+# (Content-Encoding, extensie, compressor) in volgorde van voorkeur bij het serveren
+PRECOMPRESSED: Tuple[Tuple[str, str, Any], ...] = (
+    (("br", ".br", _brotli),) if brotli is not None else ()
+) + (("gzip", ".gz", _gzip),)
+
+
+def compressed_sibling(path: Path, extension: str) -> Path:
+    return path.with_name(path.name + extension)
+
+
+def _siblings_exist(path: Path) -> bool:
+    return path.suffix not in COMPRESSIBLE_SUFFIXES or all(
+        compressed_sibling(path, extension).exists() for _, extension, _ in PRECOMPRESSED
+    )
+
+
+def write_output(path: Path, data: bytes) -> None:
+    if _has_content(path, data) and _siblings_exist(path):
+        return
+    path.write_bytes(data)
+    if path.suffix in COMPRESSIBLE_SUFFIXES:
+        for _, extension, compress in PRECOMPRESSED:
+            compressed_sibling(path, extension).write_bytes(compress(data))
+
+
+def _has_content(path: Path, data: bytes) -> bool:
+    try:
+        return path.stat().st_size == len(data) and path.read_bytes() == data
+    except OSError:
+        return False
+
+
+def outputs_exist(paths: List[Path]) -> bool:
+    return all(path.exists() and _siblings_exist(path) for path in paths)
+
+
+@lru_cache(maxsize=1)
+def code_hash() -> bytes:
+    # Codewijzigingen (templates, CSS, SVG's, datamodel) maken alle eerder gecachte build-uitvoer ongeldig
+    digest = hashlib.blake2b()
+    for source in (Path(__file__), Path(pricing.__file__)):
+        digest.update(source.read_bytes())
+    return digest.digest()
+
+
+@dataclass(slots=True, frozen=True)
 class ImageSet:
     hero: str
     detail: str
@@ -65,201 +154,229 @@ class ImageSet:
 class ServiceRepository:
     def __init__(self, data_path: Path) -> None:
         self._services = self._load(data_path)
+        self._all = tuple(self._services.values())
 
     def _load(self, data_path: Path) -> Dict[str, Service]:
-        payload = json.loads(data_path.read_text())
-        services = {}
-        for raw in payload["services"]:
-            steps = []
-            for step in raw["steps"]:
-                options = [Option(**opt) for opt in step.get("options", [])]
-                steps.append(
-                    Step(
-                        id=step["id"],
-                        label=step["label"],
-                        type=step["type"],
-                        options=options,
-                        min=step.get("min"),
-                        max=step.get("max"),
-                        price_per_unit=step.get("price_per_unit"),
-                    )
-                )
-            services[raw["id"]] = Service(
-                id=raw["id"],
-                name=raw["name"],
-                tagline=raw["tagline"],
-                summary=raw["summary"],
-                base_price=float(raw["base_price"]),
-                cta=raw["cta"],
-                steps=steps,
-                highlights=raw.get("highlights", []),
-            )
-        return services
+        stat = data_path.stat()
+        return _load_services(data_path.resolve(), stat.st_mtime_ns, stat.st_size)
 
-    def all(self) -> List[Service]:
-        return list(self._services.values())
+    def all(self) -> Tuple[Service, ...]:
+        return self._all
 
     def get(self, service_id: str) -> Service:
-        if service_id not in self._services:
-            raise KeyError(service_id)
+        # Eén hash-lookup; een onbekend id geeft dezelfde KeyError(service_id)
         return self._services[service_id]
 
 
-class PricingEngine:
-    def __init__(self, repository: ServiceRepository) -> None:
-        self.repository = repository
+def _iter_raw_services(data_path: Path) -> Iterator[Dict[str, Any]]:
+    if ijson is None:
+        yield from json_loads(data_path.read_bytes())["services"]
+        return
+    with data_path.open("rb") as handle:
+        yield from ijson.items(handle, "services.item", use_float=True)
+
+
+@lru_cache(maxsize=8)
+def _load_services(data_path: Path, mtime_ns: int, size: int) -> Dict[str, Service]:
+    # mtime_ns en size vormen samen met het pad de cachesleutel; wijzigt het bestand, dan parsen we opnieuw
+    cache_path = data_path.with_name(data_path.name + ".cache")
+    key = (mtime_ns, size, code_hash())
+    services = _read_service_cache(cache_path, key)
+    if services is None:
+        services = _parse_services(data_path)
+        _write_service_cache(cache_path, key, services)
+    return services
+
+
+def _read_service_cache(cache_path: Path, key: Tuple[int, int, bytes]) -> Optional[Dict[str, Service]]:
+    # Gepicklede dataclasses laden is sneller dan JSON parsen en alles opnieuw opbouwen
+    try:
+        cached_key, services = pickle.loads(cache_path.read_bytes())
+    except (OSError, EOFError, ImportError, pickle.UnpicklingError, AttributeError, TypeError, ValueError):
+        return None
+    return services if cached_key == key else None
+
+
+def _write_service_cache(cache_path: Path, key: Tuple[int, int, bytes], services: Dict[str, Service]) -> None:
+    temp_path = cache_path.with_name(cache_path.name + ".tmp")
+    try:
+        temp_path.write_bytes(pickle.dumps((key, services), protocol=pickle.HIGHEST_PROTOCOL))
+        os.replace(temp_path, cache_path)
+    except OSError:
+        pass  # alleen een versnelling; een alleen-lezen datamap is prima
+
+
+def _parse_services(data_path: Path) -> Dict[str, Service]:
+    services = {}
+    for raw in _iter_raw_services(data_path):
+        steps = []
+        for step in raw["steps"]:
+            options = tuple(
+                Option(**opt, precomputed_label=f"{step['label']}: {opt['label']}")
+                for opt in step.get("options", [])
+            )
+            steps.append(
+                Step(
+                    id=step["id"],
+                    label=step["label"],
+                    type=step["type"],
+                    options=options,
+                    min=step.get("min"),
+                    max=step.get("max"),
+                    price_per_unit=step.get("price_per_unit"),
+                )
+            )
+        services[raw["id"]] = Service(
+            id=raw["id"],
+            name=raw["name"],
+            tagline=raw["tagline"],
+            summary=raw["summary"],
+            base_price=float(raw["base_price"]),
+            cta=raw["cta"],
+            steps=tuple(steps),
+            highlights=tuple(raw.get("highlights", [])),
+            base_breakdown_entry={"label": "Basispakket", "amount": float(raw["base_price"])},
+            rendered_questions=_render_questions(steps),
+        )
+    return services
+
+
+def _render_questions(steps: List[Step]) -> str:
+    questions = []
+    for step in steps:
+        if step.type == "choice":
+            options_html = '\n'.join(
+                OPTION_TEMPLATE.format(
+                    step_id=escape(step.id),
+                    value=escape(opt.value),
+                    label=escape(opt.label),
+                    price=opt.price,
+                )
+                for opt in step.options
+            )
+            questions.append(CHOICE_QUESTION_TEMPLATE.format(label=escape(step.label), options=options_html))
+        elif step.type == "number":
+            questions.append(
+                NUMBER_QUESTION_TEMPLATE.format(
+                    label=escape(step.label),
+                    step_id=escape(step.id),
+                    min=step.min or 0,
+                    max=step.max or '',
+                    price_per_unit=step.price_per_unit,
+                )
+            )
+    return '\n'.join(questions)
 
-    def quote(self, service_id: str, answers: Dict[str, Any], postcode: Optional[str]) -> Dict[str, Any]:
-        service = self.repository.get(service_id)
-        subtotal = service.base_price
-        breakdown: List[Dict[str, Any]] = [
-            {"label": "Basispakket", "amount": service.base_price}
-        ]
-        for step in service.steps:
-            value = answers.get(step.id)
-            if value in (None, ""):
-                continue
-            if step.type == "choice":
-                match = next((opt for opt in step.options if opt.value == value), None)
-                if match:
-                    subtotal += match.price
-                    breakdown.append({"label": f"{step.label}: {match.label}", "amount": match.price})
-            elif step.type == "number" and step.price_per_unit:
-                units = float(value)
-                units = max(step.min or units, min(step.max or units, units))
-                amount = units * step.price_per_unit
-                subtotal += amount
-                breakdown.append({"label": f"{step.label} ({units:.0f} eenheden)", "amount": amount})
-        multiplier = self._region_multiplier(postcode)
-        total = subtotal * multiplier
-        breakdown.append({"label": "Regiofactor", "amount": round((multiplier - 1) * subtotal, 2)})
-        return {
-            "service": service.name,
-            "subtotal": round(subtotal, 2),
-            "total": round(total, 2),
-            "currency": "EUR",
-            "breakdown": breakdown,
-            "message": self._quote_message(total)
-        }
-
-    def _region_multiplier(self, postcode: Optional[str]) -> float:
-        if not postcode:
-            return 1.0
-        digits = ''.join(ch for ch in postcode if ch.isdigit())
-        if not digits:
-            return 1.0
-        number = int(digits[:2])
-        return 1.05 if number < 30 else 1.0 if number < 50 else 0.97
-
-    def _quote_message(self, total: float) -> str:
-        if total < 5000:
-            return "Plan direct een online afspraak voor een snelle uitvoering."
-        if total < 15000:
-            return "We bieden montage binnen 6 weken inclusief vergunningcheck."
-        return "Je ontvangt binnen 24 uur een compleet projectplan en planning."
+
+_WHITESPACE = re.compile(r"\s+")
+_PLACEHOLDER = re.compile(r"\{(\w+)\}")
+_PALETTE = MappingProxyType({
+    "uitbouw": "#fb923c",
+    "dakkapel": "#60a5fa",
+    "stuc-schilder": "#c084fc",
+    "kozijnen": "#38bdf8",
+    "loodgieter": "#2dd4bf",
+    "installaties": "#86efac",
+})
+
+
+def _minify_svg(svg: str) -> str:
+    return _WHITESPACE.sub(" ", svg).replace("> <", "><").strip()
+
+
+CompiledTemplate = Tuple[Tuple[bytes, ...], Tuple[str, ...]]
+
+
+def _compile_template(template: str) -> CompiledTemplate:
+    # Eenmalig bij import: opknippen in vaste bytes-fragmenten rond de {velden}
+    pieces = _PLACEHOLDER.split(template)
+    return tuple(piece.encode("utf-8") for piece in pieces[::2]), tuple(pieces[1::2])
+
+
+def _compile_svg(template: str) -> CompiledTemplate:
+    return _compile_template(_minify_svg(template))
+
+
+def _render_fragments(compiled: CompiledTemplate, values: Dict[str, bytes]) -> bytes:
+    parts, fields = compiled
+    chunks = [parts[0]]
+    for name, part in zip(fields, parts[1:]):
+        chunks.append(values[name])
+        chunks.append(part)
+    return b"".join(chunks)
+
+
+def _render_template(compiled: CompiledTemplate, values: Dict[str, str]) -> bytes:
+    return _render_fragments(compiled, {name: value.encode("utf-8") for name, value in values.items()})
+
+
+@lru_cache(maxsize=64)
+def _service_svgs(service_id: str, name: str, tagline: str, color: str) -> Tuple[bytes, bytes, bytes]:
+    # Elke waarde één keer escapen en encoderen voor alle drie de SVG's; "Stuc & Schilder"
+    # leverde anders ongeldige XML op
+    values = {
+        "color": escape(color).encode("utf-8"),
+        "name": escape(name).encode("utf-8"),
+        "tagline": escape(tagline).encode("utf-8"),
+    }
+    return (
+        _render_fragments(HERO_SVG, values),
+        _render_fragments(DETAIL_SVG, values),
+        _render_fragments(BLUEPRINT_SVG, values),
+    )
 
 
 class ImageFactory:
     def __init__(self, output_dir: Path) -> None:
         self.output_dir = output_dir
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._cache_path = output_dir / ".svgcache.json"
+        self._cache: Dict[str, str] = self._read_cache()
+        atexit.register(self.save_cache)
+
+    def is_current(self, service: Service) -> bool:
+        if self._cache.get(service.id) != self._cache_key(service):
+            return False
+        return outputs_exist(self._output_paths(service))
+
+    def remember(self, service: Service) -> None:
+        self._cache[service.id] = self._cache_key(service)
+
+    def save_cache(self) -> None:
+        self._cache_path.write_bytes(json_dumps(self._cache))
 
-    def build_for(self, service: Service) -> ImageSet:
-        color = self._color_for(service.id)
-        hero_name = f"{service.id}-hero.svg"
-        detail_name = f"{service.id}-detail.svg"
-        blueprint_name = f"{service.id}-blueprint.svg"
-        (self.output_dir / hero_name).write_text(self._hero_svg(service, color), encoding="utf-8")
-        (self.output_dir / detail_name).write_text(self._detail_svg(service, color), encoding="utf-8")
-        (self.output_dir / blueprint_name).write_text(self._blueprint_svg(service, color), encoding="utf-8")
+    def _read_cache(self) -> Dict[str, str]:
+        try:
+            return json_loads(self._cache_path.read_bytes())
+        except (OSError, ValueError):
+            return {}
+
+    def _cache_key(self, service: Service) -> str:
+        # Alleen deze velden komen in de SVG's terecht; prijswijzigingen laten de beelden staan
+        digest = hashlib.blake2b(code_hash(), digest_size=16)
+        digest.update(f"{service.id}|{service.name}|{service.tagline}|{self._color_for(service.id)}".encode("utf-8"))
+        return digest.hexdigest()
+
+    def _output_paths(self, service: Service) -> List[Path]:
+        return [
+            self.output_dir / f"{service.id}-hero.svg",
+            self.output_dir / f"{service.id}-detail.svg",
+            self.output_dir / f"{service.id}-blueprint.svg",
+        ]
+
+    def render_for(self, service: Service) -> List[Tuple[Path, bytes]]:
+        svgs = _service_svgs(service.id, service.name, service.tagline, self._color_for(service.id))
+        return list(zip(self._output_paths(service), svgs))
+
+    def image_set_for(self, service: Service) -> ImageSet:
         return ImageSet(
-            hero=f"images/{hero_name}",
-            detail=f"images/{detail_name}",
-            blueprint=f"images/{blueprint_name}",
+            hero=f"images/{service.id}-hero.svg",
+            detail=f"images/{service.id}-detail.svg",
+            blueprint=f"images/{service.id}-blueprint.svg",
         )
 
     def _color_for(self, service_id: str) -> str:
-        palette = {
-            "uitbouw": "#fb923c",
-            "dakkapel": "#60a5fa",
-            "stuc-schilder": "#c084fc",
-            "kozijnen": "#38bdf8",
-            "loodgieter": "#2dd4bf",
-            "installaties": "#86efac",
-        }
-        return palette.get(service_id, "#94a3b8")
-
-    def _hero_svg(self, service: Service, color: str) -> str:
-        return f"""
-<svg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 640 360'>
-  <defs>
-    <linearGradient id='grad' x1='0%' y1='0%' x2='100%' y2='100%'>
-      <stop offset='0%' stop-color='{color}' stop-opacity='0.95'/>
-      <stop offset='100%' stop-color='{color}' stop-opacity='0.55'/>
-    </linearGradient>
-    <linearGradient id='shine' x1='0' y1='0' x2='0' y2='1'>
-      <stop offset='0' stop-color='rgba(255,255,255,0.7)'/>
-      <stop offset='1' stop-color='rgba(255,255,255,0.1)'/>
-    </linearGradient>
-  </defs>
-  <rect width='640' height='360' rx='32' fill='url(#grad)'/>
-  <g transform='translate(60,80)'>
-    <text font-family='Manrope,Inter,sans-serif' font-size='42' fill='white' font-weight='700'>{service.name}</text>
-    <text y='60' font-family='Manrope,Inter,sans-serif' font-size='20' fill='white' opacity='0.92'>{service.tagline}</text>
-    <rect y='120' width='480' height='150' rx='26' fill='rgba(15,23,42,0.18)' stroke='rgba(255,255,255,0.45)'/>
-    <g transform='translate(40,150)' stroke='white' stroke-linecap='round'>
-      <line x1='0' y1='0' x2='380' y2='0' stroke-width='6' opacity='0.7'/>
-      <line x1='0' y1='34' x2='320' y2='34' stroke-width='5' opacity='0.5'/>
-      <line x1='0' y1='68' x2='260' y2='68' stroke-width='4' opacity='0.35'/>
-    </g>
-    <rect x='360' y='-20' width='180' height='120' rx='20' fill='url(#shine)' opacity='0.6'/>
-  </g>
-</svg>
-"""
-
-    def _detail_svg(self, service: Service, color: str) -> str:
-        return f"""
-<svg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 420 260'>
-  <defs>
-    <linearGradient id='detail' x1='0%' y1='0%' x2='100%' y2='0%'>
-      <stop offset='0%' stop-color='{color}' stop-opacity='0.35'/>
-      <stop offset='100%' stop-color='{color}' stop-opacity='0.8'/>
-    </linearGradient>
-  </defs>
-  <rect width='420' height='260' rx='26' fill='#0f172a'/>
-  <g fill='none' stroke='url(#detail)' stroke-width='3' opacity='0.7'>
-    <rect x='40' y='40' width='340' height='180' rx='18'/>
-    <line x1='40' y1='120' x2='380' y2='120'/>
-    <line x1='140' y1='40' x2='140' y2='220'/>
-  </g>
-  <g fill='white' font-family='Manrope,Inter,sans-serif' font-size='16'>
-    <text x='60' y='90'>Stap 1</text>
-    <text x='170' y='90'>Stap 2</text>
-    <text x='280' y='90'>Stap 3</text>
-    <text x='60' y='190'>Stap 4</text>
-    <text x='170' y='190'>Stap 5</text>
-    <text x='280' y='190'>Stap 6</text>
-  </g>
-  <circle cx='360' cy='220' r='18' fill='url(#detail)'/>
-  <text x='360' y='226' text-anchor='middle' font-family='Manrope,Inter,sans-serif' font-size='12' fill='#0f172a'>config</text>
-</svg>
-"""
-
-    def _blueprint_svg(self, service: Service, color: str) -> str:
-        return f"""
-<svg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 420 260'>
-  <rect width='420' height='260' rx='24' fill='#e2e8f0'/>
-  <g stroke='{color}' stroke-width='2' fill='none' opacity='0.8'>
-    <rect x='40' y='30' width='340' height='200' rx='18'/>
-    <rect x='70' y='60' width='120' height='80' rx='10'/>
-    <rect x='220' y='60' width='140' height='80' rx='10'/>
-    <rect x='70' y='160' width='120' height='50' rx='10'/>
-    <rect x='220' y='160' width='140' height='50' rx='10'/>
-    <line x1='210' y1='60' x2='210' y2='210' stroke-dasharray='6 6'/>
-  </g>
-  <text x='60' y='230' font-family='Manrope,Inter,sans-serif' font-size='18' fill='#0f172a'>{service.name}</text>
-</svg>
-"""
+        return _PALETTE.get(service_id, "#94a3b8")
 
 
 class SiteBuilder:
@@ -272,118 +389,425 @@ class SiteBuilder:
         PUBLIC_DIR.mkdir(exist_ok=True)
         (PUBLIC_DIR / "assets").mkdir(exist_ok=True)
         (PUBLIC_DIR / "images").mkdir(exist_ok=True)
-        self._write_assets()
-        for service in self.repository.all():
-            images = self.image_factory.build_for(service)
+        previous = self._read_manifest()
+        manifest: Dict[str, str] = {}
+        services = self.repository.all()
+        writes: List[Tuple[Path, bytes]] = []
+
+        manifest["assets"] = self._input_key({"css": BASE_CSS, "js": BASE_JS})
+        if not self._is_fresh(previous, manifest, "assets", [ASSET_DIR / "style.css", ASSET_DIR / "app.js"]):
+            writes += self._render_assets()
+        pending: List[Service] = []
+        for service in services:
+            images = self.image_factory.image_set_for(service)
             self.image_sets[service.id] = images
-            self._write_service_page(service, images)
-        self._write_index()
+            manifest[service.id] = self._input_key(asdict(service))
+            outputs = [PUBLIC_DIR / f"{service.id}.html"]
+            outputs += [PUBLIC_DIR / path for path in (images.hero, images.detail, images.blueprint)]
+            if not self._is_fresh(previous, manifest, service.id, outputs):
+                pending.append(service)
+        writes += self._render_services(pending)
+        manifest["index"] = self._input_key([asdict(service) for service in services])
+        if not self._is_fresh(previous, manifest, "index", [PUBLIC_DIR / "index.html"]):
+            writes.append((PUBLIC_DIR / "index.html", self._render_index(services)))
+        self._write_all(writes)
+        for service in pending:
+            self.image_factory.remember(service)
+        if writes or not any(path.exists() for path in ARCHIVE_PATHS):
+            self._write_archive()
+        MANIFEST_PATH.write_bytes(json_dumps(manifest))
         print("Site opgebouwd in", PUBLIC_DIR)
 
-    def _write_assets(self) -> None:
-        (ASSET_DIR / "style.css").write_text(BASE_CSS, encoding="utf-8")
-        (ASSET_DIR / "app.js").write_text(BASE_JS, encoding="utf-8")
-
-    def _write_index(self) -> None:
+    def _write_archive(self) -> None:
+        # Eén archief van de hele site voor deploys; de losse bestanden blijven ook staan
+        files = sorted(
+            path for path in PUBLIC_DIR.rglob("*")
+            if path.is_file() and path.name not in ARCHIVE_EXCLUDE and path not in ARCHIVE_PATHS
+        )
+        for stale in ARCHIVE_PATHS:
+            stale.unlink(missing_ok=True)
+        if zstandard is None:
+            with tarfile.open(GZIP_ARCHIVE_PATH, "w:gz", compresslevel=9) as tar:
+                self._add_to_archive(tar, files)
+            return
+        compressor = zstandard.ZstdCompressor(level=19)
+        with ZSTD_ARCHIVE_PATH.open("wb") as raw, compressor.stream_writer(raw) as stream:
+            with tarfile.open(fileobj=stream, mode="w|") as tar:
+                self._add_to_archive(tar, files)
+
+    def _add_to_archive(self, tar: tarfile.TarFile, files: List[Path]) -> None:
+        for path in files:
+            tar.add(path, arcname=str(path.relative_to(PUBLIC_DIR)))
+
+    def _read_manifest(self) -> Dict[str, str]:
+        try:
+            return json_loads(MANIFEST_PATH.read_bytes())
+        except (OSError, ValueError):
+            return {}
+
+    def _input_key(self, inputs: Any) -> str:
+        digest = hashlib.blake2b(code_hash(), digest_size=16)
+        digest.update(json_dumps(inputs))
+        return digest.hexdigest()
+
+    def _is_fresh(self, previous: Dict[str, str], manifest: Dict[str, str], name: str, outputs: List[Path]) -> bool:
+        return previous.get(name) == manifest[name] and outputs_exist(outputs)
+
+    def _render_services(self, services: List[Service]) -> List[Tuple[Path, bytes]]:
+        # Voor een handvol diensten kost het opstarten van workers meer dan het renderen zelf
+        if len(services) < PARALLEL_MIN_SERVICES:
+            rendered = list(map(self._render_service, services))
+        else:
+            workers = min(len(services), os.cpu_count() or 1)
+            # Eén chunk per worker: de builder (repository, image sets) wordt dan per worker
+            # gepickled in plaats van per dienst
+            chunksize = -(-len(services) // workers)
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                rendered = list(pool.map(self._render_service, services, chunksize=chunksize))
+        return [output for outputs in rendered for output in outputs]
+
+    def _render_service(self, service: Service) -> List[Tuple[Path, bytes]]:
+        outputs = [] if self.image_factory.is_current(service) else self.image_factory.render_for(service)
+        page = self._render_service_page(service, self.image_sets[service.id])
+        outputs.append((PUBLIC_DIR / f"{service.id}.html", page))
+        return outputs
+
+    def _write_all(self, writes: List[Tuple[Path, bytes]]) -> None:
+        # Alle bestanden van de build in één batch; de threads overlappen de open/write/close-latency
+        with ThreadPoolExecutor(max_workers=WRITE_WORKERS) as pool:
+            list(pool.map(lambda item: write_output(*item), writes))
+
+    def _render_assets(self) -> List[Tuple[Path, bytes]]:
+        return [(ASSET_DIR / "style.css", BASE_CSS_BYTES), (ASSET_DIR / "app.js", BASE_JS_BYTES)]
+
+    def _render_index(self, services: Tuple[Service, ...]) -> bytes:
         cards = []
-        for service in self.repository.all():
+        for service in services:
             images = self.image_sets.get(service.id)
             hero = images.hero if images else service.hero_image
-            highlights = '\n'.join(f"<span>{text}</span>" for text in service.highlights[:2])
+            highlights = '\n'.join(HIGHLIGHT_CHIP_TEMPLATE.format(text=escape(text)) for text in service.highlights[:2])
             cards.append(
-                f"""
-                <article class='service-card'>
-                  <img src='{hero}' alt='{service.name} illustratie' loading='lazy'>
-                  <div>
-                    <p class='eyebrow'>Configurator</p>
-                    <h3>{service.name}</h3>
-                    <p>{service.summary}</p>
-                    <div class='chips'>{highlights}</div>
-                    <a class='btn' href='{service.id}.html'>{service.cta}</a>
-                  </div>
-                </article>
-                """
-            )
-        content = INDEX_TEMPLATE.format(service_cards='\n'.join(cards))
-        (PUBLIC_DIR / "index.html").write_text(content, encoding="utf-8")
-
-    def _write_service_page(self, service: Service, images: ImageSet) -> None:
-        questions = []
-        for step in service.steps:
-            if step.type == "choice":
-                options_html = '\n'.join(
-                    f"<label class='option'>"
-                    f"<input type='radio' name='{step.id}' value='{opt.value}' required>"
-                    f"<span>{opt.label} <small>+€{opt.price:,.0f}</small></span>"
-                    f"</label>" for opt in step.options
-                )
-                questions.append(
-                    f"""
-                    <section class='question'>
-                      <div class='question-heading'>
-                        <span class='eyebrow'>Stap</span>
-                        <h3>{step.label}</h3>
-                      </div>
-                      <div class='options'>{options_html}</div>
-                    </section>
-                    """
+                SERVICE_CARD_TEMPLATE.format(
+                    hero=escape(hero),
+                    name=escape(service.name),
+                    summary=escape(service.summary),
+                    highlights=highlights,
+                    service_id=escape(service.id),
+                    cta=escape(service.cta),
                 )
-            elif step.type == "number":
-                questions.append(
-                    f"""
-                    <section class='question'>
-                      <div class='question-heading'>
-                        <span class='eyebrow'>Stap</span>
-                        <h3>{step.label}</h3>
-                      </div>
-                      <input type='number' name='{step.id}' min='{step.min or 0}' max='{step.max or ''}' step='1' required data-input-type='number'>
-                      <p class='hint'>€{step.price_per_unit:.0f} per eenheid</p>
-                    </section>
-                    """
-                )
-        highlights = '\n'.join(f"<li><span>✦</span>{text}</li>" for text in service.highlights)
-        page = SERVICE_TEMPLATE.format(
-            name=service.name,
-            tagline=service.tagline,
-            summary=service.summary,
-            hero=images.hero,
-            detail=images.detail,
-            blueprint=images.blueprint,
-            service_id=service.id,
-            questions='\n'.join(questions),
-            highlights=highlights,
+            )
+        return _render_template(INDEX_PAGE, {"service_cards": '\n'.join(cards)})
+
+    def _render_service_page(self, service: Service, images: ImageSet) -> bytes:
+        highlights = '\n'.join(HIGHLIGHT_ITEM_TEMPLATE.format(text=escape(text)) for text in service.highlights)
+        return _render_template(SERVICE_PAGE, {
+            "name": escape(service.name),
+            "tagline": escape(service.tagline),
+            "summary": escape(service.summary),
+            "hero": escape(images.hero),
+            "detail": escape(images.detail),
+            "blueprint": escape(images.blueprint),
+            "service_id": escape(service.id),
+            "questions": service.rendered_questions,
+            "highlights": highlights,
+            # "</" escapen zodat een label het script-blok nooit kan afsluiten
+            "pricing_config": json_dumps(pricing.client_config(service)).decode("utf-8").replace("</", "<\\/"),
+        })
+
+
+def handle_quote_request(engine: PricingEngine, body: bytes) -> Tuple[HTTPStatus, Dict[str, Any]]:
+    try:
+        payload = json_loads(body)
+    except Exception as exc:  # pylint: disable=broad-except
+        return HTTPStatus.BAD_REQUEST, {"error": str(exc)}
+    return _quote_payload(engine, payload)
+
+
+def handle_quote_batch(engine: PricingEngine, body: bytes) -> Tuple[HTTPStatus, Any]:
+    try:
+        items = json_loads(body)
+    except Exception as exc:  # pylint: disable=broad-except
+        return HTTPStatus.BAD_REQUEST, {"error": str(exc)}
+    if not isinstance(items, list):
+        return HTTPStatus.BAD_REQUEST, {"error": "Verwacht een lijst met quote-aanvragen"}
+    if len(items) > MAX_BATCH_QUOTES:
+        return HTTPStatus.BAD_REQUEST, {"error": f"Maximaal {MAX_BATCH_QUOTES} quotes per batch"}
+    # Per item hetzelfde antwoord als /api/quote; een fout in één item laat de andere intact
+    return HTTPStatus.OK, [_quote_payload(engine, item)[1] for item in items]
+
+
+def _quote_payload(engine: PricingEngine, payload: Any) -> Tuple[HTTPStatus, Dict[str, Any]]:
+    try:
+        get = payload.get
+        return HTTPStatus.OK, engine.quote(get("service_id"), get("answers", {}), get("postcode"))
+    except KeyError as exc:
+        return HTTPStatus.NOT_FOUND, {"error": f"Service niet gevonden: {exc}"}
+    except Exception as exc:  # pylint: disable=broad-except
+        return HTTPStatus.BAD_REQUEST, {"error": str(exc)}
+
+
+QuoteResponder = Callable[[bytes], Tuple[HTTPStatus, bytes]]
+REJECTED_BODY = json_dumps({"error": "Ongeldige of te grote aanvraag"})
+
+
+def body_length_status(content_length: Optional[str]) -> Tuple[int, Optional[HTTPStatus]]:
+    # Te grote of ongeldige bodies weigeren vóór het inlezen
+    try:
+        length = int(content_length or 0)
+    except ValueError:
+        return -1, HTTPStatus.BAD_REQUEST
+    if length < 0:
+        return length, HTTPStatus.BAD_REQUEST
+    if length > MAX_BODY_BYTES:
+        return length, HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+    return length, None
+
+
+def make_quote_responder(
+    engine: PricingEngine,
+    handle: Callable[[PricingEngine, bytes], Tuple[HTTPStatus, Any]] = handle_quote_request,
+    cache: bool = True,
+) -> QuoteResponder:
+    def respond(body: bytes) -> Tuple[HTTPStatus, bytes]:
+        status, payload = handle(engine, body)
+        return status, json_dumps(payload)
+
+    if not cache:
+        return respond
+
+    # De configurator stuurt voor dezelfde invoer byte-identieke bodies; dan komt het
+    # kant-en-klare JSON-antwoord uit de cache, zonder parse, berekening of serialisatie
+    cached = lru_cache(maxsize=pricing.QUOTE_CACHE_SIZE)(respond)
+
+    def respond_cached(body: bytes) -> Tuple[HTTPStatus, bytes]:
+        return cached(body) if len(body) <= QUOTE_CACHE_MAX_BODY else respond(body)
+
+    return respond_cached
+
+
+def make_quote_routes(engine: PricingEngine) -> Dict[str, QuoteResponder]:
+    return {
+        "/api/quote": make_quote_responder(engine),
+        # Batches zijn groot en zelden identiek; de losse quotes gaan wel via de engine-cache
+        "/api/quote/batch": make_quote_responder(engine, handle_quote_batch, cache=False),
+    }
+
+
+@lru_cache(maxsize=16)
+def _json_head_prefix(protocol_version: str, status: HTTPStatus, server: str) -> bytes:
+    return (
+        f"{protocol_version} {status.value} {status.phrase}\r\n"
+        f"Server: {server}\r\n"
+        "Content-Type: application/json\r\n"
+    ).encode("latin-1")
+
+
+@dataclass(slots=True, frozen=True)
+class StaticFile:
+    content_type: str
+    mtime: float
+    last_modified: str
+    # (Content-Encoding, inhoud) in volgorde van voorkeur; eindigt altijd met "identity"
+    variants: Tuple[Tuple[str, bytes], ...]
+
+
+def load_static_files(public_dir: Path) -> Dict[str, StaticFile]:
+    # public/ is vooraf gebouwd: alles één keer inlezen bespaart per GET een open/fstat/read
+    static: Dict[str, StaticFile] = {}
+    for path in public_dir.rglob("*"):
+        if (
+            not path.is_file()
+            or path.name.startswith(".")
+            or path in ARCHIVE_PATHS
+            or any(path.name.endswith(extension) for _, extension, _ in PRECOMPRESSED)
+        ):
+            continue
+        variants = []
+        if path.suffix in COMPRESSIBLE_SUFFIXES:
+            for encoding, extension, _ in PRECOMPRESSED:
+                compressed = compressed_sibling(path, extension)
+                if compressed.is_file():
+                    variants.append((encoding, compressed.read_bytes()))
+        variants.append(("identity", path.read_bytes()))
+        mtime = path.stat().st_mtime
+        entry = StaticFile(
+            content_type=mimetypes.guess_type(path.name)[0] or "application/octet-stream",
+            mtime=mtime,
+            last_modified=formatdate(int(mtime), usegmt=True),
+            variants=tuple(variants),
         )
-        (PUBLIC_DIR / f"{service.id}.html").write_text(page, encoding="utf-8")
+        url = "/" + path.relative_to(public_dir).as_posix()
+        static[url] = entry
+        if path.name == "index.html":
+            static[url[: -len("index.html")]] = entry
+    return static
 
 
 class QuoteHandler(SimpleHTTPRequestHandler):
-    def __init__(self, *args, engine: PricingEngine, directory: str, **kwargs):
-        self.engine = engine
+    # Keep-alive voor de opeenvolgende quote-requests; elk antwoord stuurt een Content-Length mee
+    protocol_version = "HTTP/1.1"
+    # Zet TCP_NODELAY op elke verbinding zodat kleine JSON-antwoorden niet op Nagle wachten
+    disable_nagle_algorithm = True
+    # Gebufferde wfile: statusregel, headers en een klein antwoord gaan in één send() de deur uit
+    wbufsize = 8192
+
+    def __init__(
+        self,
+        *args,
+        quote_routes: Dict[str, QuoteResponder],
+        directory: str,
+        static: Optional[Dict[str, StaticFile]] = None,
+        **kwargs,
+    ):
+        self.quote_routes = quote_routes
+        self.static = static or {}
         super().__init__(*args, directory=directory, **kwargs)
 
+    def handle_expect_100(self) -> bool:
+        # Het 100 Continue moet direct weg; in de wfile-buffer wacht de client er tevergeefs op
+        result = super().handle_expect_100()
+        self.wfile.flush()
+        return result
+
+    def do_GET(self) -> None:  # noqa: N802
+        if not self._send_static(include_body=True):
+            super().do_GET()
+
+    def do_HEAD(self) -> None:  # noqa: N802
+        if not self._send_static(include_body=False):
+            super().do_HEAD()
+
     def do_POST(self) -> None:  # noqa: N802
-        if self.path != "/api/quote":
+        respond = self.quote_routes.get(self.path)
+        if respond is None:
             return super().do_POST()
-        length = int(self.headers.get('Content-Length', '0'))
-        body = self.rfile.read(length)
+        length, rejected = body_length_status(self.headers.get("Content-Length"))
+        if rejected is not None:
+            # De ongelezen rest maakt de verbinding onbruikbaar, dus die sluiten we
+            self.close_connection = True
+            return self._send_json(rejected, REJECTED_BODY)
+        body = self.rfile.read(length) if length else b""
+        self._send_json(*respond(body))
+
+    def send_head(self):
+        accepted = self._accepted_encodings()
+        if accepted:
+            path = Path(self.translate_path(self.path))
+            if path.is_dir() and urlsplit(self.path).path.endswith("/"):
+                path = path / "index.html"
+            if path.suffix in COMPRESSIBLE_SUFFIXES:
+                for encoding, extension, _ in PRECOMPRESSED:
+                    compressed = compressed_sibling(path, extension)
+                    if encoding in accepted and compressed.is_file():
+                        # Revalidatie tegen het origineel, zoals SimpleHTTPRequestHandler dat doet
+                        if self._not_modified(path.stat().st_mtime):
+                            self.send_response(HTTPStatus.NOT_MODIFIED)
+                            self.end_headers()
+                            return None
+                        return self._send_compressed_head(path, compressed, encoding)
+        return super().send_head()
+
+    def copyfile(self, source, outputfile) -> None:
+        # Statische bestanden (ook de .br/.gz-varianten) gaan via sendfile direct van pagecache naar socket
+        try:
+            in_fd = source.fileno()
+            out_fd = outputfile.fileno()
+        except (AttributeError, OSError):
+            return super().copyfile(source, outputfile)
+        offset = source.tell()
+        size = os.fstat(in_fd).st_size
+        # Gebufferde headers eerst naar de socket, anders komt sendfile ervoor
+        outputfile.flush()
         try:
-            payload = json.loads(body)
-            service_id = payload.get("service_id")
-            answers = payload.get("answers", {})
-            postcode = payload.get("postcode")
-            quote = self.engine.quote(service_id, answers, postcode)
-            self._send_json(HTTPStatus.OK, quote)
-        except KeyError as exc:
-            self._send_json(HTTPStatus.NOT_FOUND, {"error": f"Service niet gevonden: {exc}"})
-        except Exception as exc:  # pylint: disable=broad-except
-            self._send_json(HTTPStatus.BAD_REQUEST, {"error": str(exc)})
-
-    def _send_json(self, status: HTTPStatus, payload: Dict[str, Any]) -> None:
-        data = json.dumps(payload).encode("utf-8")
-        self.send_response(status)
-        self.send_header("Content-Type", "application/json")
-        self.send_header("Content-Length", str(len(data)))
+            while offset < size:
+                sent = os.sendfile(out_fd, in_fd, offset, size - offset)
+                if not sent:
+                    break
+                offset += sent
+        except (AttributeError, OSError):
+            if offset != source.tell():
+                raise
+            super().copyfile(source, outputfile)
+
+    def _send_static(self, include_body: bool) -> bool:
+        entry = self.static.get(unquote(urlsplit(self.path).path))
+        # Onbekende paden laat de standaardafhandeling doen
+        if entry is None:
+            return False
+        if self._not_modified(entry.mtime):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.end_headers()
+            return True
+        accepted = self._accepted_encodings()
+        for encoding, body in entry.variants:
+            if encoding == "identity" or encoding in accepted:
+                break
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", entry.content_type)
+        if encoding != "identity":
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Last-Modified", entry.last_modified)
+        if len(entry.variants) > 1:
+            self.send_header("Vary", "Accept-Encoding")
         self.end_headers()
+        if include_body:
+            self.wfile.write(body)
+        return True
+
+    def _not_modified(self, mtime: float) -> bool:
+        if "If-Modified-Since" not in self.headers or "If-None-Match" in self.headers:
+            return False
+        try:
+            since = parsedate_to_datetime(self.headers["If-Modified-Since"])
+        except (TypeError, IndexError, OverflowError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        if since.tzinfo is not timezone.utc:
+            return False
+        return datetime.fromtimestamp(mtime, timezone.utc).replace(microsecond=0) <= since
+
+    def _accepted_encodings(self) -> frozenset:
+        accepted = set()
+        for part in self.headers.get("Accept-Encoding", "").split(","):
+            name, _, params = part.partition(";")
+            name = name.strip().lower()
+            if not name:
+                continue
+            # "gzip;q=0" betekent expliciet níet gzip
+            quality = 1.0
+            for param in params.split(";"):
+                key, _, value = param.partition("=")
+                if key.strip().lower() == "q":
+                    try:
+                        quality = float(value)
+                    except ValueError:
+                        quality = 0.0
+            if quality > 0:
+                accepted.add(name)
+        return frozenset(accepted)
+
+    def _send_compressed_head(self, path: Path, compressed: Path, encoding: str):
+        handle = compressed.open("rb")
+        stat = os.fstat(handle.fileno())
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", self.guess_type(str(path)))
+        self.send_header("Content-Encoding", encoding)
+        self.send_header("Content-Length", str(stat.st_size))
+        self.send_header("Last-Modified", self.date_time_string(int(stat.st_mtime)))
+        self.send_header("Vary", "Accept-Encoding")
+        self.end_headers()
+        return handle
+
+    def _send_json(self, status: HTTPStatus, data: bytes) -> None:
+        self.log_request(status)
+        # Alleen Date en Content-Length wisselen per antwoord; de rest komt kant-en-klaar uit de cache.
+        # De gebufferde wfile (wbufsize) voegt headers en body samen tot één send()
+        prefix = _json_head_prefix(self.protocol_version, status, self.version_string())
+        date = self.date_time_string().encode("latin-1")
+        connection = b"Connection: close\r\n" if self.close_connection else b""
+        self.wfile.write(b"%sDate: %s\r\n%sContent-Length: %d\r\n\r\n" % (prefix, date, connection, len(data)))
         self.wfile.write(data)
 
 
@@ -632,7 +1056,11 @@ form button {
 
 
 BASE_JS = """
-async function requestQuote(form, serviceId) {
+// Begrensd zoals de lru_cache op de server: Map houdt invoegvolgorde aan, de eerste sleutel is de oudste
+const QUOTE_CACHE_SIZE = 256;
+const quoteCache = new Map();
+
+function formAnswers(form) {
   const formData = new FormData(form);
   const answers = {};
   for (const [key, value] of formData.entries()) {
@@ -644,16 +1072,95 @@ async function requestQuote(form, serviceId) {
       answers[key] = value;
     }
   }
+  return answers;
+}
+
+function quoteRequestBody(form, serviceId) {
   const postcode = form.querySelector('[name="postcode"]').value;
+  return JSON.stringify({ service_id: serviceId, answers: formAnswers(form), postcode });
+}
+
+async function requestQuote(form, serviceId, signal) {
+  const body = quoteRequestBody(form, serviceId);
+  if (quoteCache.has(body)) {
+    const cached = quoteCache.get(body);
+    quoteCache.delete(body);
+    quoteCache.set(body, cached);
+    return cached;
+  }
   const response = await fetch('/api/quote', {
     method: 'POST',
     headers: { 'Content-Type': 'application/json' },
-    body: JSON.stringify({ service_id: serviceId, answers, postcode })
+    body,
+    signal
   });
   if (!response.ok) {
     throw new Error('Serverfout, probeer opnieuw.');
   }
-  return response.json();
+  const quote = await response.json();
+  quoteCache.set(body, quote);
+  if (quoteCache.size > QUOTE_CACHE_SIZE) {
+    quoteCache.delete(quoteCache.keys().next().value);
+  }
+  return quote;
+}
+
+// Spiegel van PricingEngine.quote: live bijwerken zonder round-trip, de server blijft leidend bij verzenden
+function roundHalfEven(value) {
+  // Zoals Python's round(): exacte halven gaan naar het even getal
+  const rounded = Math.round(value);
+  return Math.abs(value % 1) === 0.5 && rounded % 2 !== 0 ? rounded - 1 : rounded;
+}
+
+function roundCents(value) {
+  // toFixed rondt net als Python af op de exacte binaire waarde; alleen echte halven (x.125, x.375, ...) gaan naar even
+  if (Number.isInteger(value * 8) && !Number.isInteger(value * 4)) {
+    return roundHalfEven(value * 100) / 100;
+  }
+  return Number(value.toFixed(2));
+}
+
+function regionMultiplier(config, postcode) {
+  if (!postcode) return 1;
+  let digits = postcode.slice(0, 2);
+  if (!/^\\d\\d$/.test(digits)) {
+    digits = postcode.replace(/\\D+/g, '').slice(0, 2);
+    if (!digits) return 1;
+  }
+  return config.region_table[Number(digits)];
+}
+
+function computeQuote(config, answers, postcode) {
+  let subtotal = config.base_price;
+  const breakdown = [{ label: config.base_label, amount: config.base_price }];
+  for (const step of config.steps) {
+    const value = answers[step.id];
+    if (value === undefined || value === null || value === '') continue;
+    if (step.choices) {
+      if (typeof value === 'string' && Object.hasOwn(step.choices, value)) {
+        const [label, price] = step.choices[value];
+        subtotal += price;
+        breakdown.push({ label, amount: price });
+      }
+    } else {
+      let units = Number(value);
+      units = Math.max(step.min || units, Math.min(step.max || units, units));
+      const amount = units * step.price_per_unit;
+      subtotal += amount;
+      breakdown.push({ label: `${step.label} (${roundHalfEven(units)} eenheden)`, amount });
+    }
+  }
+  const multiplier = regionMultiplier(config, postcode);
+  const total = subtotal * multiplier;
+  breakdown.push({ label: 'Regiofactor', amount: roundCents((multiplier - 1) * subtotal) });
+  let index = 0;
+  while (index < config.message_thresholds.length && !(total < config.message_thresholds[index])) index++;
+  return {
+    subtotal: roundCents(subtotal),
+    total: roundCents(total),
+    breakdown,
+    message: config.messages[index]
+  };
 }
 
 function hydrateConfigurator() {
@@ -664,41 +1171,69 @@ function hydrateConfigurator() {
   const breakdown = document.querySelector('[data-breakdown]');
   const message = document.querySelector('[data-message]');
   const totalField = summary.querySelector('[data-total]');
+  const configScript = document.querySelector('[data-service-config]');
+  const config = configScript ? JSON.parse(configScript.textContent) : null;
+  let inFlight = null;
+
+  function render(quote) {
+    totalField.textContent = `\u20AC ${quote.total.toLocaleString('nl-NL')}`;
+    breakdown.innerHTML = '';
+    quote.breakdown.forEach(row => {
+      const li = document.createElement('li');
+      const label = document.createElement('span');
+      const amount = document.createElement('strong');
+      // textContent in plaats van innerHTML: labels uit de data worden nooit als HTML geïnterpreteerd
+      label.textContent = row.label;
+      amount.textContent = `\u20AC ${Number(row.amount).toLocaleString('nl-NL')}`;
+      li.append(label, amount);
+      breakdown.appendChild(li);
+    });
+    message.textContent = quote.message;
+  }
+
+  function preview() {
+    if (!config) return update();
+    const postcode = form.querySelector('[name="postcode"]').value;
+    render(computeQuote(config, formAnswers(form), postcode));
+  }
 
   async function update() {
+    if (inFlight) inFlight.abort();
+    const controller = new AbortController();
+    inFlight = controller;
     summary.classList.add('is-loading');
     try {
-      const quote = await requestQuote(form, serviceId);
-      totalField.textContent = `\u20AC ${quote.total.toLocaleString('nl-NL')}`;
-      breakdown.innerHTML = '';
-      quote.breakdown.forEach(row => {
-        const li = document.createElement('li');
-        li.innerHTML = `<span>${row.label}</span><strong>\u20AC ${Number(row.amount).toLocaleString('nl-NL')}</strong>`;
-        breakdown.appendChild(li);
-      });
-      message.textContent = quote.message;
+      render(await requestQuote(form, serviceId, controller.signal));
     } catch (err) {
-      message.textContent = err.message;
+      if (err.name !== 'AbortError') {
+        message.textContent = err.message;
+      }
     } finally {
-      summary.classList.remove('is-loading');
+      if (inFlight === controller) {
+        inFlight = null;
+        summary.classList.remove('is-loading');
+      }
     }
   }
 
   form.addEventListener('input', () => {
     clearTimeout(form._debounce);
-    form._debounce = setTimeout(update, 300);
+    form._debounce = setTimeout(preview, config ? 0 : 300);
   });
   form.addEventListener('submit', (event) => {
     event.preventDefault();
     update();
   });
-  update();
+  preview();
 }
 
 document.addEventListener('DOMContentLoaded', hydrateConfigurator);
 
 """
 
+BASE_CSS_BYTES = BASE_CSS.encode("utf-8")
+BASE_JS_BYTES = BASE_JS.encode("utf-8")
+
 INDEX_TEMPLATE = """
 
 <!doctype html>
@@ -773,6 +1308,7 @@ SERVICE_TEMPLATE = """
             {questions}
             <button type='submit'>Bereken prijs & offerte</button>
           </form>
+          <script type='application/json' data-service-config>{pricing_config}</script>
         </article>
         <aside class='summary' data-summary>
           <h3>Indicatieve offerte</h3>
@@ -787,17 +1323,138 @@ SERVICE_TEMPLATE = """
 </html>
 """
 
+SERVICE_CARD_TEMPLATE = """
+                <article class='service-card'>
+                  <img src='{hero}' alt='{name} illustratie' loading='lazy'>
+                  <div>
+                    <p class='eyebrow'>Configurator</p>
+                    <h3>{name}</h3>
+                    <p>{summary}</p>
+                    <div class='chips'>{highlights}</div>
+                    <a class='btn' href='{service_id}.html'>{cta}</a>
+                  </div>
+                </article>
+                """
 
+HIGHLIGHT_CHIP_TEMPLATE = "<span>{text}</span>"
 
-def build_site() -> None:
-    repository = ServiceRepository(DATA_DIR / "services.json")
-    SiteBuilder(repository).build()
+HIGHLIGHT_ITEM_TEMPLATE = "<li><span>✦</span>{text}</li>"
 
+OPTION_TEMPLATE = (
+    "<label class='option'>"
+    "<input type='radio' name='{step_id}' value='{value}' required>"
+    "<span>{label} <small>+€{price:,.0f}</small></span>"
+    "</label>"
+)
 
-def serve_site(port: int) -> None:
-    repository = ServiceRepository(DATA_DIR / "services.json")
-    engine = PricingEngine(repository)
-    handler = lambda *args, **kwargs: QuoteHandler(*args, directory=str(PUBLIC_DIR), engine=engine, **kwargs)
+CHOICE_QUESTION_TEMPLATE = """
+                    <section class='question'>
+                      <div class='question-heading'>
+                        <span class='eyebrow'>Stap</span>
+                        <h3>{label}</h3>
+                      </div>
+                      <div class='options'>{options}</div>
+                    </section>
+                    """
+
+NUMBER_QUESTION_TEMPLATE = """
+                    <section class='question'>
+                      <div class='question-heading'>
+                        <span class='eyebrow'>Stap</span>
+                        <h3>{label}</h3>
+                      </div>
+                      <input type='number' name='{step_id}' min='{min}' max='{max}' step='1' required data-input-type='number'>
+                      <p class='hint'>€{price_per_unit:.0f} per eenheid</p>
+                    </section>
+                    """
+
+
+HERO_SVG_TEMPLATE = """
+<svg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 640 360'>
+  <defs>
+    <linearGradient id='grad' x1='0%' y1='0%' x2='100%' y2='100%'>
+      <stop offset='0%' stop-color='{color}' stop-opacity='0.95'/>
+      <stop offset='100%' stop-color='{color}' stop-opacity='0.55'/>
+    </linearGradient>
+    <linearGradient id='shine' x1='0' y1='0' x2='0' y2='1'>
+      <stop offset='0' stop-color='rgba(255,255,255,0.7)'/>
+      <stop offset='1' stop-color='rgba(255,255,255,0.1)'/>
+    </linearGradient>
+  </defs>
+  <rect width='640' height='360' rx='32' fill='url(#grad)'/>
+  <g transform='translate(60,80)'>
+    <text font-family='Manrope,Inter,sans-serif' font-size='42' fill='white' font-weight='700'>{name}</text>
+    <text y='60' font-family='Manrope,Inter,sans-serif' font-size='20' fill='white' opacity='0.92'>{tagline}</text>
+    <rect y='120' width='480' height='150' rx='26' fill='rgba(15,23,42,0.18)' stroke='rgba(255,255,255,0.45)'/>
+    <g transform='translate(40,150)' stroke='white' stroke-linecap='round'>
+      <line x1='0' y1='0' x2='380' y2='0' stroke-width='6' opacity='0.7'/>
+      <line x1='0' y1='34' x2='320' y2='34' stroke-width='5' opacity='0.5'/>
+      <line x1='0' y1='68' x2='260' y2='68' stroke-width='4' opacity='0.35'/>
+    </g>
+    <rect x='360' y='-20' width='180' height='120' rx='20' fill='url(#shine)' opacity='0.6'/>
+  </g>
+</svg>
+"""
+
+DETAIL_SVG_TEMPLATE = """
+<svg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 420 260'>
+  <defs>
+    <linearGradient id='detail' x1='0%' y1='0%' x2='100%' y2='0%'>
+      <stop offset='0%' stop-color='{color}' stop-opacity='0.35'/>
+      <stop offset='100%' stop-color='{color}' stop-opacity='0.8'/>
+    </linearGradient>
+  </defs>
+  <rect width='420' height='260' rx='26' fill='#0f172a'/>
+  <g fill='none' stroke='url(#detail)' stroke-width='3' opacity='0.7'>
+    <rect x='40' y='40' width='340' height='180' rx='18'/>
+    <line x1='40' y1='120' x2='380' y2='120'/>
+    <line x1='140' y1='40' x2='140' y2='220'/>
+  </g>
+  <g fill='white' font-family='Manrope,Inter,sans-serif' font-size='16'>
+    <text x='60' y='90'>Stap 1</text>
+    <text x='170' y='90'>Stap 2</text>
+    <text x='280' y='90'>Stap 3</text>
+    <text x='60' y='190'>Stap 4</text>
+    <text x='170' y='190'>Stap 5</text>
+    <text x='280' y='190'>Stap 6</text>
+  </g>
+  <circle cx='360' cy='220' r='18' fill='url(#detail)'/>
+  <text x='360' y='226' text-anchor='middle' font-family='Manrope,Inter,sans-serif' font-size='12' fill='#0f172a'>config</text>
+</svg>
+"""
+
+BLUEPRINT_SVG_TEMPLATE = """
+<svg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 420 260'>
+  <rect width='420' height='260' rx='24' fill='#e2e8f0'/>
+  <g stroke='{color}' stroke-width='2' fill='none' opacity='0.8'>
+    <rect x='40' y='30' width='340' height='200' rx='18'/>
+    <rect x='70' y='60' width='120' height='80' rx='10'/>
+    <rect x='220' y='60' width='140' height='80' rx='10'/>
+    <rect x='70' y='160' width='120' height='50' rx='10'/>
+    <rect x='220' y='160' width='140' height='50' rx='10'/>
+    <line x1='210' y1='60' x2='210' y2='210' stroke-dasharray='6 6'/>
+  </g>
+  <text x='60' y='230' font-family='Manrope,Inter,sans-serif' font-size='18' fill='#0f172a'>{name}</text>
+</svg>
+"""
+
+INDEX_PAGE = _compile_template(INDEX_TEMPLATE)
+SERVICE_PAGE = _compile_template(SERVICE_TEMPLATE)
+HERO_SVG = _compile_svg(HERO_SVG_TEMPLATE)
+DETAIL_SVG = _compile_svg(DETAIL_SVG_TEMPLATE)
+BLUEPRINT_SVG = _compile_svg(BLUEPRINT_SVG_TEMPLATE)
+
+
+def build_site(repository: Optional[ServiceRepository] = None) -> None:
+    SiteBuilder(repository or ServiceRepository(DATA_DIR / "services.json")).build()
+
+
+def serve_site(port: int, repository: Optional[ServiceRepository] = None) -> None:
+    quote_routes = make_quote_routes(PricingEngine(repository or ServiceRepository(DATA_DIR / "services.json")))
+    static = load_static_files(PUBLIC_DIR)
+    handler = lambda *args, **kwargs: QuoteHandler(
+        *args, directory=str(PUBLIC_DIR), quote_routes=quote_routes, static=static, **kwargs
+    )
     server = ThreadingHTTPServer(("0.0.0.0", port), handler)
     print(f"Server draait op http://localhost:{port}")
     try:
@@ -806,6 +1463,68 @@ def serve_site(port: int) -> None:
         print("\nServer gestopt")
 
 
+def create_asgi_app():
+    # Factory zodat elke uvicorn-worker zijn eigen repository en quote-cache opbouwt
+    from starlette.applications import Starlette
+    from starlette.responses import Response
+    from starlette.routing import Mount, Route
+    from starlette.staticfiles import StaticFiles
+
+    repository = ServiceRepository(DATA_DIR / "services.json")
+
+    def quote_endpoint(respond):
+        async def endpoint(request):
+            _, rejected = body_length_status(request.headers.get("content-length"))
+            if rejected is None:
+                # Ook zonder (of met een onjuiste) Content-Length nooit meer dan MAX_BODY_BYTES inlezen
+                body = b""
+                async for chunk in request.stream():
+                    body += chunk
+                    if len(body) > MAX_BODY_BYTES:
+                        rejected = HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+                        break
+            if rejected is not None:
+                return Response(
+                    REJECTED_BODY, status_code=rejected, media_type="application/json", headers={"Connection": "close"}
+                )
+            status, data = respond(body)
+            return Response(data, status_code=status, media_type="application/json")
+
+        return endpoint
+
+    quote_routes = make_quote_routes(PricingEngine(repository))
+    return Starlette(
+        routes=[
+            *(Route(path, quote_endpoint(respond), methods=["POST"]) for path, respond in quote_routes.items()),
+            Mount("/", StaticFiles(directory=str(PUBLIC_DIR), html=True)),
+        ]
+    )
+
+
+def serve_site_async(port: int, workers: int = 1, repository: Optional[ServiceRepository] = None) -> None:
+    try:
+        import starlette  # noqa: F401
+        import uvicorn
+    except ImportError:
+        print("uvicorn/starlette niet gevonden, val terug op de threaded server")
+        serve_site(port, repository)
+        return
+
+    print(f"Async server draait op http://localhost:{port} met {workers} worker(s)")
+    # loop/http "auto" kiest uvloop en httptools zodra die geïnstalleerd zijn; meerdere
+    # workers vereisen een importeerbare factory in plaats van een app-object
+    uvicorn.run(
+        f"{Path(__file__).stem}:create_asgi_app",
+        factory=True,
+        app_dir=str(ROOT),
+        host="0.0.0.0",
+        port=port,
+        workers=workers,
+        loop="auto",
+        http="auto",
+    )
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Site builder en server")
     sub = parser.add_subparsers(dest="command")
@@ -813,14 +1532,25 @@ def main() -> None:
     sub.add_parser("build", help="Genereer HTML + assets")
     serve_cmd = sub.add_parser("serve", help="Start de lokale server")
     serve_cmd.add_argument("--port", type=int, default=4173)
+    serve_cmd.add_argument("--async", dest="use_async", action="store_true", help="Gebruik uvicorn + Starlette")
+    serve_cmd.add_argument(
+        "--workers", type=int, default=os.cpu_count() or 1, help="Aantal uvicorn-workers (alleen met --async)"
+    )
 
     args = parser.parse_args()
     if args.command == "build":
         build_site()
     elif args.command == "serve":
+        # Eén repository voor build en server, zodat services.json maar één keer geladen wordt;
+        # uvicorn-workers laden hun eigen exemplaar, dus alleen aanmaken als we hem echt delen
+        repository = None
         if not PUBLIC_DIR.exists():
-            build_site()
-        serve_site(args.port)
+            repository = ServiceRepository(DATA_DIR / "services.json")
+            build_site(repository)
+        if args.use_async:
+            serve_site_async(args.port, args.workers, repository)
+        else:
+            serve_site(args.port, repository)
     else:
         parser.print_help()
 
@@ -0,0 +1,94 @@
+"""Controleert dat computeQuote in de browser hetzelfde rekent als PricingEngine.quote.
+
+Gebruik:
+    python check_pricing_js.py            # 3000 willekeurige gevallen, vereist node
+    python check_pricing_js.py --cases 10000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import shutil
+import subprocess
+import sys
+from typing import Any, Dict, List, Tuple
+
+import app
+import pricing
+
+POSTCODES = ("", "1234AB", "2999", "3000", "3500", "4999", "5000", "9999ZZ", "ab12", "x", "5", "0", "12 34")
+UNITS = (0, 1, 2, 2.5, 3, 3.33, 4.875, 6.5, 7.5, 11.125, 20, 100, "4", "12.5")
+
+
+def random_case(service: pricing.Service, rng: random.Random) -> Tuple[Dict[str, Any], str]:
+    answers: Dict[str, Any] = {}
+    for step in service.steps:
+        if rng.random() < 0.2:
+            continue
+        if step.type == "choice":
+            answers[step.id] = rng.choice([opt.value for opt in step.options] + ["onbekend"])
+        else:
+            answers[step.id] = rng.choice(UNITS + (step.min or 1, step.max or 1))
+    return answers, rng.choice(POSTCODES)
+
+
+def run_js(cases: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # Dezelfde app.js die de build wegschrijft; de DOM-hook is het enige dat we moeten stubben
+    program = "\n".join((
+        "const document = { addEventListener() {} };",
+        app.BASE_JS,
+        f"const cases = {json.dumps(cases)};",
+        "console.log(JSON.stringify(cases.map(c => computeQuote(c.config, c.answers, c.postcode))));",
+    ))
+    result = subprocess.run(["node"], input=program, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+
+def comparable(quote: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "subtotal": quote["subtotal"],
+        "total": quote["total"],
+        "message": quote["message"],
+        "breakdown": [(row["label"], float(row["amount"])) for row in quote["breakdown"]],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Vergelijk computeQuote (JS) met PricingEngine.quote (Python)")
+    parser.add_argument("--cases", type=int, default=3000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    if shutil.which("node") is None:
+        print("node niet gevonden; controle overgeslagen")
+        return 0
+
+    repository = app.ServiceRepository(app.DATA_DIR / "services.json")
+    engine = pricing.PricingEngine(repository)
+    configs = {service.id: pricing.client_config(service) for service in repository.all()}
+    rng = random.Random(args.seed)
+    services = repository.all()
+
+    cases = []
+    expected = []
+    for index in range(args.cases):
+        service = services[index % len(services)]
+        answers, postcode = random_case(service, rng)
+        cases.append({"config": configs[service.id], "answers": answers, "postcode": postcode})
+        expected.append(engine.quote(service.id, answers, postcode))
+
+    mismatches = 0
+    for case, python_quote, js_quote in zip(cases, expected, run_js(cases)):
+        if comparable(python_quote) != comparable(js_quote):
+            mismatches += 1
+            if mismatches <= 10:
+                print(f"Verschil voor {case['answers']} / {case['postcode']!r}:")
+                print(f"  python: {comparable(python_quote)}")
+                print(f"  js:     {comparable(js_quote)}")
+    print(f"{args.cases} gevallen, {mismatches} verschillen")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,216 @@
+"""Prijsmodel en -berekening voor de configurators.
+
+Bewust los van app.py en volledig getypeerd, zodat deze module met mypyc
+naar een C-extensie gecompileerd kan worden (zie README). app.py importeert
+dan transparant de gecompileerde versie.
+"""
+from __future__ import annotations
+
+import re
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Protocol, Tuple
+
+QUOTE_CACHE_SIZE = 4096
+# Grotere sleutels zijn geen configurator-invoer; die rekenen we uit zonder ze te cachen
+QUOTE_CACHE_MAX_ANSWERS = 16
+QUOTE_CACHE_MAX_TEXT = 64
+
+# Bedragen uit services.json zijn vaak ints; als float geannoteerd maakt mypyc er floats van
+Amount = float | int
+
+
+@dataclass(slots=True, frozen=True)
+class Option:
+    label: str
+    value: str
+    price: Amount = 0.0
+    # Afgeleide velden tellen niet mee in == en hash(); zo blijven de records hashbaar
+    precomputed_label: str = field(default="", repr=False, compare=False)
+
+
+@dataclass(slots=True, frozen=True)
+class Step:
+    id: str
+    label: str
+    type: str
+    options: Tuple[Option, ...] = ()
+    min: Optional[Amount] = None
+    max: Optional[Amount] = None
+    price_per_unit: Optional[Amount] = None
+
+
+@dataclass(slots=True, frozen=True)
+class Service:
+    id: str
+    name: str
+    tagline: str
+    summary: str
+    base_price: Amount
+    cta: str
+    steps: Tuple[Step, ...]
+    highlights: Tuple[str, ...] = ()
+    # Afgeleide velden tellen niet mee in == en hash(); zo blijven de records hashbaar
+    base_breakdown_entry: Dict[str, Any] = field(default_factory=dict, repr=False, compare=False)
+    rendered_questions: str = field(default="", repr=False, compare=False)
+
+    @property
+    def hero_image(self) -> str:
+        return f"images/{self.id}-hero.svg"
+
+
+class ServiceLookup(Protocol):
+    def get(self, service_id: str) -> Service: ...
+
+
+FrozenAnswers = Tuple[Tuple[str, Any], ...]
+# (label, bedrag); pas bij het opbouwen van het antwoord worden dit dicts
+BreakdownRow = Tuple[str, Amount]
+Evaluator = Callable[[Dict[str, Any]], Tuple[Amount, List[BreakdownRow]]]
+# (step_id, keuzes of None voor een getalstap, label, min, max, prijs per eenheid)
+CompiledStep = Tuple[str, Optional[Dict[str, Tuple[str, Amount]]], str, Optional[Amount], Optional[Amount], Amount]
+
+
+def compile_evaluator(service: Service) -> Evaluator:
+    steps: List[CompiledStep] = []
+    for step in service.steps:
+        if step.type == "choice":
+            choices = {opt.value: (opt.precomputed_label, opt.price) for opt in step.options}
+            steps.append((step.id, choices, step.label, None, None, 0.0))
+        elif step.type == "number" and step.price_per_unit:
+            steps.append((step.id, None, step.label, step.min, step.max, step.price_per_unit))
+    compiled = tuple(steps)
+    base_price = service.base_price
+    base_row: BreakdownRow = (service.base_breakdown_entry["label"], service.base_breakdown_entry["amount"])
+
+    def evaluate(answers: Dict[str, Any]) -> Tuple[Amount, List[BreakdownRow]]:
+        subtotal: Amount = base_price
+        breakdown: List[BreakdownRow] = [base_row]
+        for step_id, choices, label, low, high, per_unit in compiled:
+            value = answers.get(step_id)
+            if value is None or value == "":
+                continue
+            if choices is not None:
+                match = choices.get(value) if isinstance(value, str) else None
+                if match:
+                    subtotal += match[1]
+                    breakdown.append(match)
+            else:
+                # JSON-getallen met decimalen zijn al float; alleen ints en strings gaan door float()
+                units: Amount = value if type(value) is float else float(value)
+                units = max(low or units, min(high or units, units))
+                amount = units * per_unit
+                subtotal += amount
+                breakdown.append((f"{label} ({units:.0f} eenheden)", amount))
+        return subtotal, breakdown
+
+    return evaluate
+
+
+_NON_DIGITS = re.compile(r"\D+")
+# Regiofactor per tweecijferig postcodeprefix: 00-29 Randstad, 30-49 midden, 50-99 overig
+_REGION_TABLE: Tuple[float, ...] = (1.05,) * 30 + (1.0,) * 20 + (0.97,) * 50
+_MESSAGE_THRESHOLDS = (5000, 15000)
+_MESSAGES = (
+    "Plan direct een online afspraak voor een snelle uitvoering.",
+    "We bieden montage binnen 6 weken inclusief vergunningcheck.",
+    "Je ontvangt binnen 24 uur een compleet projectplan en planning.",
+)
+
+
+def client_config(service: Service) -> Dict[str, Any]:
+    # Alles wat assets/app.js nodig heeft om PricingEngine.quote in de browser na te rekenen
+    steps: List[Dict[str, Any]] = []
+    for step in service.steps:
+        if step.type == "choice":
+            choices = {opt.value: [opt.precomputed_label, opt.price] for opt in step.options}
+            steps.append({"id": step.id, "choices": choices})
+        elif step.type == "number" and step.price_per_unit:
+            steps.append({
+                "id": step.id,
+                "label": step.label,
+                "min": step.min,
+                "max": step.max,
+                "price_per_unit": step.price_per_unit,
+            })
+    return {
+        "base_label": service.base_breakdown_entry["label"],
+        "base_price": service.base_price,
+        "steps": steps,
+        "region_table": _REGION_TABLE,
+        "message_thresholds": _MESSAGE_THRESHOLDS,
+        "messages": _MESSAGES,
+    }
+
+
+def _is_small_key(service_id: Any, frozen_answers: FrozenAnswers, postcode: Any) -> bool:
+    if len(frozen_answers) > QUOTE_CACHE_MAX_ANSWERS:
+        return False
+    texts = [service_id, postcode]
+    for key, value in frozen_answers:
+        texts.append(key)
+        texts.append(value)
+    return not any(isinstance(text, str) and len(text) > QUOTE_CACHE_MAX_TEXT for text in texts)
+
+
+class PricingEngine:
+    def __init__(self, repository: ServiceLookup) -> None:
+        self.repository = repository
+        self._cached_quote: Callable[[str, FrozenAnswers, Optional[str]], Dict[str, Any]] = lru_cache(
+            maxsize=QUOTE_CACHE_SIZE
+        )(self._quote_frozen)
+        # service_id -> (dienstnaam, evaluator): één lookup per quote, de repository alleen bij de eerste
+        self._evaluators: Dict[str, Tuple[str, Evaluator]] = {}
+
+    def quote(self, service_id: str, answers: Dict[str, Any], postcode: Optional[str]) -> Dict[str, Any]:
+        # De configurator stuurt bij elke wijziging opnieuw; identieke antwoorden komen uit de cache.
+        # Lege antwoorden tellen niet mee in de prijs en dus ook niet in de sleutel.
+        frozen_answers = tuple(sorted((key, value) for key, value in answers.items() if value not in (None, "")))
+        try:
+            hash(frozen_answers)
+        except TypeError:
+            return self._response(self._quote(service_id, answers, postcode))
+        if not _is_small_key(service_id, frozen_answers, postcode):
+            return self._response(self._quote(service_id, answers, postcode))
+        return self._response(self._cached_quote(service_id, frozen_answers, postcode))
+
+    def _response(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        # Het (gecachete) resultaat bevat onveranderlijke tuples; elke aanroeper krijgt eigen dicts
+        return dict(result, breakdown=[{"label": label, "amount": amount} for label, amount in result["breakdown"]])
+
+    def _quote_frozen(self, service_id: str, frozen_answers: FrozenAnswers, postcode: Optional[str]) -> Dict[str, Any]:
+        return self._quote(service_id, dict(frozen_answers), postcode)
+
+    def _quote(self, service_id: str, answers: Dict[str, Any], postcode: Optional[str]) -> Dict[str, Any]:
+        compiled = self._evaluators.get(service_id)
+        if compiled is None:
+            service = self.repository.get(service_id)
+            compiled = self._evaluators[service_id] = (service.name, compile_evaluator(service))
+        name, evaluator = compiled
+        subtotal, breakdown = evaluator(answers)
+        multiplier = self._region_multiplier(postcode)
+        total = subtotal * multiplier
+        breakdown.append(("Regiofactor", round((multiplier - 1) * subtotal, 2)))
+        return {
+            "service": name,
+            "subtotal": round(subtotal, 2),
+            "total": round(total, 2),
+            "currency": "EUR",
+            "breakdown": tuple(breakdown),
+            "message": self._quote_message(total)
+        }
+
+    def _region_multiplier(self, postcode: Optional[str]) -> float:
+        if not postcode:
+            return 1.0
+        digits = postcode[:2]
+        # Snelle route voor de gangbare Nederlandse postcode die met twee cijfers begint
+        if len(digits) != 2 or not digits.isdecimal():
+            digits = _NON_DIGITS.sub("", postcode)[:2]
+            if not digits:
+                return 1.0
+        return _REGION_TABLE[int(digits)]
+
+    def _quote_message(self, total: float) -> str:
+        return _MESSAGES[bisect_right(_MESSAGE_THRESHOLDS, total)]
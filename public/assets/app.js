@@ -1,5 +1,9 @@
 
-async function requestQuote(form, serviceId) {
+// Begrensd zoals de lru_cache op de server: Map houdt invoegvolgorde aan, de eerste sleutel is de oudste
+const QUOTE_CACHE_SIZE = 256;
+const quoteCache = new Map();
+
+function formAnswers(form) {
   const formData = new FormData(form);
   const answers = {};
   for (const [key, value] of formData.entries()) {
@@ -11,16 +15,95 @@ async function requestQuote(form, serviceId) {
       answers[key] = value;
     }
   }
+  return answers;
+}
+
+function quoteRequestBody(form, serviceId) {
   const postcode = form.querySelector('[name="postcode"]').value;
+  return JSON.stringify({ service_id: serviceId, answers: formAnswers(form), postcode });
+}
+
+async function requestQuote(form, serviceId, signal) {
+  const body = quoteRequestBody(form, serviceId);
+  if (quoteCache.has(body)) {
+    const cached = quoteCache.get(body);
+    quoteCache.delete(body);
+    quoteCache.set(body, cached);
+    return cached;
+  }
   const response = await fetch('/api/quote', {
     method: 'POST',
     headers: { 'Content-Type': 'application/json' },
-    body: JSON.stringify({ service_id: serviceId, answers, postcode })
+    body,
+    signal
   });
   if (!response.ok) {
     throw new Error('Serverfout, probeer opnieuw.');
   }
-  return response.json();
+  const quote = await response.json();
+  quoteCache.set(body, quote);
+  if (quoteCache.size > QUOTE_CACHE_SIZE) {
+    quoteCache.delete(quoteCache.keys().next().value);
+  }
+  return quote;
+}
+
+// Spiegel van PricingEngine.quote: live bijwerken zonder round-trip, de server blijft leidend bij verzenden
+function roundHalfEven(value) {
+  // Zoals Python's round(): exacte halven gaan naar het even getal
+  const rounded = Math.round(value);
+  return Math.abs(value % 1) === 0.5 && rounded % 2 !== 0 ? rounded - 1 : rounded;
+}
+
+function roundCents(value) {
+  // toFixed rondt net als Python af op de exacte binaire waarde; alleen echte halven (x.125, x.375, ...) gaan naar even
+  if (Number.isInteger(value * 8) && !Number.isInteger(value * 4)) {
+    return roundHalfEven(value * 100) / 100;
+  }
+  return Number(value.toFixed(2));
+}
+
+function regionMultiplier(config, postcode) {
+  if (!postcode) return 1;
+  let digits = postcode.slice(0, 2);
+  if (!/^\d\d$/.test(digits)) {
+    digits = postcode.replace(/\D+/g, '').slice(0, 2);
+    if (!digits) return 1;
+  }
+  return config.region_table[Number(digits)];
+}
+
+function computeQuote(config, answers, postcode) {
+  let subtotal = config.base_price;
+  const breakdown = [{ label: config.base_label, amount: config.base_price }];
+  for (const step of config.steps) {
+    const value = answers[step.id];
+    if (value === undefined || value === null || value === '') continue;
+    if (step.choices) {
+      if (typeof value === 'string' && Object.hasOwn(step.choices, value)) {
+        const [label, price] = step.choices[value];
+        subtotal += price;
+        breakdown.push({ label, amount: price });
+      }
+    } else {
+      let units = Number(value);
+      units = Math.max(step.min || units, Math.min(step.max || units, units));
+      const amount = units * step.price_per_unit;
+      subtotal += amount;
+      breakdown.push({ label: `${step.label} (${roundHalfEven(units)} eenheden)`, amount });
+    }
+  }
+  const multiplier = regionMultiplier(config, postcode);
+  const total = subtotal * multiplier;
+  breakdown.push({ label: 'Regiofactor', amount: roundCents((multiplier - 1) * subtotal) });
+  let index = 0;
+  while (index < config.message_thresholds.length && !(total < config.message_thresholds[index])) index++;
+  return {
+    subtotal: roundCents(subtotal),
+    total: roundCents(total),
+    breakdown,
+    message: config.messages[index]
+  };
 }
 
 function hydrateConfigurator() {
@@ -31,35 +114,60 @@ function hydrateConfigurator() {
   const breakdown = document.querySelector('[data-breakdown]');
   const message = document.querySelector('[data-message]');
   const totalField = summary.querySelector('[data-total]');
+  const configScript = document.querySelector('[data-service-config]');
+  const config = configScript ? JSON.parse(configScript.textContent) : null;
+  let inFlight = null;
+
+  function render(quote) {
+    totalField.textContent = `€ ${quote.total.toLocaleString('nl-NL')}`;
+    breakdown.innerHTML = '';
+    quote.breakdown.forEach(row => {
+      const li = document.createElement('li');
+      const label = document.createElement('span');
+      const amount = document.createElement('strong');
+      // textContent in plaats van innerHTML: labels uit de data worden nooit als HTML geïnterpreteerd
+      label.textContent = row.label;
+      amount.textContent = `€ ${Number(row.amount).toLocaleString('nl-NL')}`;
+      li.append(label, amount);
+      breakdown.appendChild(li);
+    });
+    message.textContent = quote.message;
+  }
+
+  function preview() {
+    if (!config) return update();
+    const postcode = form.querySelector('[name="postcode"]').value;
+    render(computeQuote(config, formAnswers(form), postcode));
+  }
 
   async function update() {
+    if (inFlight) inFlight.abort();
+    const controller = new AbortController();
+    inFlight = controller;
     summary.classList.add('is-loading');
     try {
-      const quote = await requestQuote(form, serviceId);
-      totalField.textContent = `€ ${quote.total.toLocaleString('nl-NL')}`;
-      breakdown.innerHTML = '';
-      quote.breakdown.forEach(row => {
-        const li = document.createElement('li');
-        li.innerHTML = `<span>${row.label}</span><strong>€ ${Number(row.amount).toLocaleString('nl-NL')}</strong>`;
-        breakdown.appendChild(li);
-      });
-      message.textContent = quote.message;
+      render(await requestQuote(form, serviceId, controller.signal));
     } catch (err) {
-      message.textContent = err.message;
+      if (err.name !== 'AbortError') {
+        message.textContent = err.message;
+      }
     } finally {
-      summary.classList.remove('is-loading');
+      if (inFlight === controller) {
+        inFlight = null;
+        summary.classList.remove('is-loading');
+      }
     }
   }
 
   form.addEventListener('input', () => {
     clearTimeout(form._debounce);
-    form._debounce = setTimeout(update, 300);
+    form._debounce = setTimeout(preview, config ? 0 : 300);
   });
   form.addEventListener('submit', (event) => {
     event.preventDefault();
     update();
   });
-  update();
+  preview();
 }
 
 document.addEventListener('DOMContentLoaded', hydrateConfigurator);
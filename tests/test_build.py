@@ -0,0 +1,35 @@
+import unittest
+from unittest import mock
+
+import app
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optionele dependency
+    orjson = None
+
+
+@unittest.skipIf(orjson is None, "orjson niet geïnstalleerd")
+class JsonBackendTest(unittest.TestCase):
+    def setUp(self):
+        self.builder = app.SiteBuilder(app.ServiceRepository(app.DATA_DIR / "services.json"))
+        self.images = app.ImageSet(hero="hero.svg", detail="detail.svg", blueprint="blueprint.svg")
+
+    def render(self, dumps):
+        with mock.patch.object(app, "json_dumps", dumps):
+            return {
+                service.id: self.builder._render_service_page(service, self.images)
+                for service in self.builder.repository.all()
+            }
+
+    def test_stdlib_fallback_renders_same_pages(self):
+        self.assertEqual(self.render(app._stdlib_json_dumps), self.render(orjson.dumps))
+
+    def test_stdlib_fallback_matches_orjson_bytes(self):
+        for service in self.builder.repository.all():
+            config = app.pricing.client_config(service)
+            self.assertEqual(app._stdlib_json_dumps(config), orjson.dumps(config))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import json
+import socket
+import threading
+import unittest
+from http.server import ThreadingHTTPServer
+
+import app
+
+
+class ExpectContinueTest(unittest.TestCase):
+    def setUp(self):
+        repository = app.ServiceRepository(app.DATA_DIR / "services.json")
+        quote_routes = app.make_quote_routes(app.PricingEngine(repository))
+        handler = lambda *args, **kwargs: app.QuoteHandler(
+            *args, directory=str(app.PUBLIC_DIR), quote_routes=quote_routes, **kwargs
+        )
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+    def test_100_continue_arrives_before_body(self):
+        body = json.dumps({"service_id": "uitbouw", "answers": {"breedte": "3m"}}).encode()
+        head = (
+            "POST /api/quote HTTP/1.1\r\n"
+            "Host: localhost\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Expect: 100-continue\r\n"
+            "Connection: close\r\n\r\n"
+        ).encode()
+        with socket.create_connection(self.server.server_address, timeout=2) as sock:
+            sock.sendall(head)
+            interim = sock.recv(1024)
+            self.assertTrue(interim.startswith(b"HTTP/1.1 100"), interim)
+            sock.sendall(body)
+            response = b""
+            while chunk := sock.recv(65536):
+                response += chunk
+        self.assertTrue(response.startswith(b"HTTP/1.1 200"), response[:100])
+        self.assertIn(b'"total"', response)
+
+
+if __name__ == "__main__":
+    unittest.main()